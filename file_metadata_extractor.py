@@ -3,17 +3,27 @@
 import os
 import sys
 import argparse
+import json
+import contextlib
+import importlib.util
 from datetime import datetime
-from pathlib import Path
 import re
+import functools
+import hashlib
+import time
+import mmap
 import logging
 import traceback
-import mimetypes
 import csv
-import stat
 import tempfile
 import subprocess
-from typing import List, Tuple, Optional
+import site
+import sysconfig
+import multiprocessing
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Tuple, Optional
 
 # Enable UTF-8 output for Windows console
 if sys.platform == "win32":
@@ -23,17 +33,17 @@ if sys.platform == "win32":
 
 # Required dependencies with versions
 REQUIRED_PACKAGES = {
+    'pypdfium2': '4.30.0',  # PDFium - fast page counting
     'PyPDF2': '3.0.1',
     'openpyxl': '3.1.2',
     'fitz': None  # PyMuPDF - optional fallback
 }
 
 def check_package_installed(package_name: str, version: str = None) -> bool:
-    """Check if a package is installed and optionally check version."""
+    """Check if a package is installed (located, not imported) and optionally check version."""
     try:
-        __import__(package_name)
-        return True
-    except ImportError:
+        return importlib.util.find_spec(package_name) is not None
+    except (ImportError, ValueError):
         return False
 
 def install_package(package_name: str, version: str = None) -> bool:
@@ -47,6 +57,8 @@ def install_package(package_name: str, version: str = None) -> bool:
             sys.executable, '-m', 'pip', 'install', package_spec
         ], capture_output=True, text=True, check=True)
         
+        # Let the lazy imports later in this process see the new package
+        importlib.invalidate_caches()
         print(f"[SUCCESS] {package_name} installed successfully")
         return True
     except subprocess.CalledProcessError as e:
@@ -143,262 +155,609 @@ def ensure_dependencies() -> tuple:
             print(f"[ERROR] Input error: {e}")
             print("[ERROR] Invalid choice. Please enter 1, 2, or 3.")
 
+# Per-user cache directory for the dependency stamp and the PDF page counts
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'file-indexer')
+
+def make_cache_dir() -> str:
+    """Create the cache directory, private to the user (it holds case file paths)."""
+    os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+    return CACHE_DIR
+
+# Stamp left after a complete dependency check, so warm runs can skip it
+
+def dependency_stamp_path() -> str:
+    """Stamp file for this interpreter and dependency list."""
+    key = repr((sorted(REQUIRED_PACKAGES.items(), key=str), sys.version, sys.executable))
+    return os.path.join(CACHE_DIR, hashlib.sha256(key.encode()).hexdigest()[:16] + '.ok')
+
+def load_dependency_stamp(stamp: str) -> Optional[dict]:
+    """Dependency status recorded by the last check, or None if the stamp is missing or stale.
+    
+    The stamp is stale once the interpreter or a site-packages directory is newer than it.
+    """
+    try:
+        stamp_mtime = os.path.getmtime(stamp)
+        with open(stamp, encoding='utf-8') as file:
+            installed = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(installed, list):
+        return None
+    
+    # Installing or removing a package touches site-packages, which invalidates the stamp
+    watched = {sys.executable, *(sysconfig.get_paths()[name] for name in ('purelib', 'platlib'))}
+    if site.ENABLE_USER_SITE:
+        watched.add(site.getusersitepackages())
+    for path in watched:
+        try:
+            if os.path.getmtime(path) >= stamp_mtime:
+                return None
+        except OSError:
+            continue
+    
+    missing = {package: version for package, version in REQUIRED_PACKAGES.items()
+               if package not in installed}
+    return {
+        'all_available': not missing,
+        'installed': {package: True for package in REQUIRED_PACKAGES if package in installed},
+        'missing': missing,
+        'install_attempted': {}
+    }
+
+def write_dependency_stamp(stamp: str, status: dict):
+    """Record the packages a check found, once every required one is there.
+    
+    The optional PyMuPDF ('fitz') does not hold the stamp back; failing to write
+    it only costs the next run a check.
+    """
+    if any(package not in status['installed'] for package in REQUIRED_PACKAGES if package != 'fitz'):
+        return
+    try:
+        make_cache_dir()
+        with open(stamp, 'w', encoding='utf-8') as file:
+            json.dump(sorted(status['installed']), file)
+    except OSError:
+        pass
+
 # Initialize global variables
+PYPDFIUM2_AVAILABLE = False
 PYPDF2_AVAILABLE = False
 PYMUPDF_AVAILABLE = False  
 OPENPYXL_AVAILABLE = False
-PyPDF2 = None
-fitz = None
-Workbook = None
-load_workbook = None
-get_column_letter = None
-Font = None
-Alignment = None
-Border = None
-Side = None
+DEPENDENCY_STATUS = {'installed': {}}
 
 def load_dependencies(status: dict):
-    """Load dependencies based on availability status."""
-    global PYPDF2_AVAILABLE, PYMUPDF_AVAILABLE, OPENPYXL_AVAILABLE
-    global PyPDF2, fitz, Workbook, load_workbook, get_column_letter, Font, Alignment, Border, Side
+    """Record available dependencies; each is imported where it is first used."""
+    global PYPDFIUM2_AVAILABLE, PYPDF2_AVAILABLE, PYMUPDF_AVAILABLE, OPENPYXL_AVAILABLE
+    global DEPENDENCY_STATUS
     
-    # Load PyPDF2
-    if 'PyPDF2' in status['installed']:
-        try:
-            import PyPDF2
-            PYPDF2_AVAILABLE = True
-        except ImportError:
-            PYPDF2_AVAILABLE = False
+    # Remembered so worker processes can load the same dependencies
+    DEPENDENCY_STATUS = status
     
-    # Load PyMuPDF (optional)
-    if 'fitz' in status['installed']:
-        try:
-            import fitz
-            PYMUPDF_AVAILABLE = True
-        except ImportError:
-            PYMUPDF_AVAILABLE = False
-    
-    # Load openpyxl
-    if 'openpyxl' in status['installed']:
-        try:
-            from openpyxl import load_workbook, Workbook
-            from openpyxl.utils import get_column_letter
-            from openpyxl.styles import Font, Alignment, Border, Side
-            OPENPYXL_AVAILABLE = True
-        except ImportError:
-            OPENPYXL_AVAILABLE = False
+    # Importing pypdfium2, PyPDF2, PyMuPDF and openpyxl is deferred so startup, --help and
+    # runs that never touch a PDF or workbook do not pay for them
+    PYPDFIUM2_AVAILABLE = 'pypdfium2' in status['installed']
+    PYPDF2_AVAILABLE = 'PyPDF2' in status['installed']
+    PYMUPDF_AVAILABLE = 'fitz' in status['installed']  # optional
+    OPENPYXL_AVAILABLE = 'openpyxl' in status['installed']
 
 # Setup logging
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
 def setup_logging(debug: bool = False):
     """Setup logging configuration."""
     level = logging.DEBUG if debug else logging.INFO
-    format_str = '%(asctime)s - %(levelname)s - %(message)s'
-    logging.basicConfig(level=level, format=format_str)
+    logging.basicConfig(level=level, format=LOG_FORMAT)
     return logging.getLogger(__name__)
 
+def add_log_file(log_file: str):
+    """Also write this module's log records to log_file (appending)."""
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    logger.addHandler(file_handler)
+
+def get_log_file() -> Optional[str]:
+    """Path of the --log-file handler, if one is attached."""
+    for handler in logger.handlers:
+        if isinstance(handler, logging.FileHandler):
+            return handler.baseFilename
+    return None
+
 logger = setup_logging()
 
+# Page tree patterns for the raw PDF scan: the /Pages node /Count (keys may come
+# in either order) and, as a fallback, the individual /Type /Page objects.
+PDF_PAGES_COUNT_RE = re.compile(
+    rb'/Type\s*/Pages\b[^>]*?/Count\s+(\d+)|/Count\s+(\d+)[^>]*?/Type\s*/Pages\b'
+)
+PDF_PAGE_RE = re.compile(rb'/Type\s*/Page\b')
+
+# Page object markers counted by the last-resort estimate
+PDF_ESTIMATE_RE = re.compile(rb'/Type ?/Page|endobj')
+
+# Page counts and the methods that produced them by pdf_fingerprint, per process
+PAGE_COUNT_CACHE = {}
+PAGE_COUNT_CACHE_SIZE = 4096
+
+# Page counting methods that read the document's own page tree; only their counts
+# are stored between runs (the scan, the estimate and the fallback 1 are retried)
+EXACT_PAGE_METHODS = frozenset({'trailer', 'pdfium', 'pymupdf', 'pypdf2'})
+
+# [pages, method] of PDFs seen by earlier runs, keyed by page_cache_key; the
+# least recently used entries are dropped beyond PAGE_CACHE_MAX_ENTRIES
+PAGE_CACHE_FILE = os.path.join(CACHE_DIR, 'pages.json')
+PAGE_CACHE_MAX_ENTRIES = 50000
+
+# Fewer PDFs to count than this are counted inline: starting worker processes (a
+# bootloader start each in the frozen Windows build) costs more than it saves
+PARALLEL_MIN_PDFS = 8
+
+# Cross-reference patterns for reading /Count via startxref -> trailer /Root -> /Pages
+PDF_STARTXREF_RE = re.compile(rb'startxref\s+(\d+)')
+PDF_XREF_SUBSECTION_RE = re.compile(rb'\s*(\d+) (\d+)[ \t]*\r?\n')
+PDF_TRAILER_REF_RE = re.compile(rb'/(Root|Prev)\s+(\d+)')
+PDF_PAGES_REF_RE = re.compile(rb'/Pages\s+(\d+)\s+\d+\s+R')
+PDF_COUNT_RE = re.compile(rb'/Count\s+(\d+)')
+
+# Catalog reference for the scan, in a classic trailer or an xref stream dictionary
+PDF_ROOT_REF_RE = re.compile(rb'/Root\s+(\d+)\s+\d+\s+R')
+
+# 12-hour clock hour and Spanish AM/PM suffix, indexed by the 0-23 hour
+HOUR_12 = tuple((hour % 12) or 12 for hour in range(24))
+AM_PM = ("a. m.",) * 12 + ("p. m.",) * 12
+
+# Worksheet column headers in Spanish (row 11)
+EXCEL_HEADERS = (
+    'Nombre Documento',
+    'Fecha Creación Documento',
+    'Fecha Incorporación Expediente',
+    'Orden Documento',
+    'Número Páginas',
+    'Página Inicio',
+    'Página Fin',
+    'Formato',
+    'Tamaño',
+    'Origen',
+    'Observaciones',
+)
+
+# Worksheet column widths
+COLUMN_WIDTHS = {
+    'A': 25,  # Nombre Documento
+    'B': 18,  # Fecha Creación
+    'C': 18,  # Fecha Incorporación
+    'D': 8,   # Orden
+    'E': 10,  # Número Páginas
+    'F': 10,  # Página Inicio
+    'G': 10,  # Página Fin
+    'H': 12,  # Formato
+    'I': 15,  # Tamaño
+    'J': 12,  # Origen
+    'K': 20,  # Observaciones
+}
+
+# CSV export columns, in the order data rows are collected
+CSV_HEADERS = (
+    'Nombre Documento',
+    'Fecha Creación Documento',
+    'Fecha Incorporación Expediente',
+    'Orden Documento',
+    'Página Inicio',
+    'Número Páginas',
+    'Página Fin',
+    'Formato',
+    'Tamaño',
+    'Origen',
+    'Observaciones',
+)
+
+# Excel extension swapped for '.csv' when the output falls back to CSV
+XL_EXT_RE = re.compile(r'\.xls[xm]$')
+
+# Numeric prefix of names like '01FileName'
+NUMBER_PREFIX_RE = re.compile(r'^(\d+)')
+
 
 def extract_number_from_filename(filename: str) -> int:
     """Extract the number from filenames like '01FileName', '02OtherFileName', etc."""
-    match = re.match(r'^(\d+)', filename)
+    match = NUMBER_PREFIX_RE.match(filename)
+    # Unnumbered names sort last, after prefixes of any length (radicación numbers run to 23 digits)
     return int(match.group(1)) if match else float('inf')
 
 
-def get_file_mime_type(file_path: str) -> str:
-    """Get file MIME type using multiple methods."""
+def read_xref_section(data, offset: int) -> Optional[Tuple[List[Tuple[int, int, int]], dict]]:
+    """Read a classic xref table into (first, count, entries offset) subsections and its trailer refs."""
+    if data[offset:offset + 4] != b'xref':
+        # Cross-reference stream (PDF 1.5+) or a bad offset
+        return None
+    
+    subsections = []
+    pos = offset + 4
+    match = PDF_XREF_SUBSECTION_RE.match(data, pos)
+    while match:
+        first, count = int(match.group(1)), int(match.group(2))
+        # Entries are fixed 20-byte lines, so they are skipped rather than parsed
+        subsections.append((first, count, match.end()))
+        pos = match.end() + count * 20
+        match = PDF_XREF_SUBSECTION_RE.match(data, pos)
+    
+    trailer = data[pos:data.find(b'startxref', pos)]
+    refs = {key.decode(): int(value) for key, value in PDF_TRAILER_REF_RE.findall(trailer)}
+    return subsections, refs
+
+def read_pdf_object(data, sections: list, number: int) -> Optional[bytes]:
+    """Read the body of an object through the xref sections (newest first)."""
+    for subsections, _ in sections:
+        for first, count, pos in subsections:
+            if first <= number < first + count:
+                entry = data[pos + (number - first) * 20:pos + (number - first + 1) * 20]
+                if entry[17:18] != b'n':
+                    # Free entry: the object was deleted
+                    return None
+                offset = int(entry[:10])
+                body = data[offset:data.find(b'endobj', offset)]
+                return body if body.split(None, 1)[:1] == [str(number).encode()] else None
+    return None
+
+def get_pdf_pages_trailer(file_path: str, data) -> Optional[int]:
+    """Get PDF pages from the /Count of the page tree root, located through the trailer."""
     try:
-        # First try mimetypes module
-        mime_type, _ = mimetypes.guess_type(file_path)
-        if mime_type:
-            logger.debug(f"MIME type for {file_path}: {mime_type}")
-            return mime_type
+        logger.debug("Trying trailer lookup for %s", file_path)
+        startxref = PDF_STARTXREF_RE.findall(data[-1024:])
+        if not startxref:
+            return None
         
-        # Fallback: read file header
-        with open(file_path, 'rb') as file:
-            header = file.read(16)
-            
-        # Common file signatures
-        signatures = {
-            b'%PDF-': 'application/pdf',
-            b'\x89PNG': 'image/png',
-            b'\xff\xd8\xff': 'image/jpeg',
-            b'GIF8': 'image/gif',
-            b'RIFF': 'audio/wav',  # or video
-            b'ID3': 'audio/mp3',
-            b'\xff\xfb': 'audio/mp3',
-            b'\xff\xf3': 'audio/mp3',
-            b'\xff\xf2': 'audio/mp3',
-            b'ftyp': 'video/mp4',  # offset 4 bytes
-            b'\x1a\x45\xdf\xa3': 'video/webm',
-        }
+        # Follow /Prev through incremental updates; newer sections shadow older ones
+        sections = []
+        offset = int(startxref[-1])
+        while offset is not None and len(sections) < 64:
+            section = read_xref_section(data, offset)
+            if section is None:
+                logger.debug("No classic xref table in %s", file_path)
+                return None
+            sections.append(section)
+            offset = section[1].get('Prev')
         
-        for sig, mime in signatures.items():
-            if header.startswith(sig):
-                logger.debug(f"Detected {mime} for {file_path} by signature")
-                return mime
-                
-        # Check MP4 at offset 4
-        if len(header) >= 8 and header[4:8] == b'ftyp':
-            logger.debug(f"Detected video/mp4 for {file_path} by offset signature")
-            return 'video/mp4'
-            
-        logger.debug(f"Unknown file type for {file_path}, header: {header[:8]}")
-        return 'application/octet-stream'
+        root = sections[0][1].get('Root')
+        catalog = read_pdf_object(data, sections, root) if root is not None else None
+        pages_ref = PDF_PAGES_REF_RE.search(catalog) if catalog else None
+        pages_node = read_pdf_object(data, sections, int(pages_ref.group(1))) if pages_ref else None
+        count = PDF_COUNT_RE.search(pages_node) if pages_node else None
+        if not count or not int(count.group(1)):
+            logger.debug("Trailer lookup found no page count for %s", file_path)
+            return None
         
+        page_count = int(count.group(1))
+        logger.debug("Trailer lookup success: %s pages for %s", page_count, file_path)
+        return page_count
     except Exception as e:
-        logger.error(f"Error detecting MIME type for {file_path}: {e}")
-        return 'application/octet-stream'
+        logger.error("Trailer lookup failed for %s: %s: %s", file_path, type(e).__name__, str(e))
+        return None
 
-def is_valid_pdf(file_path: str) -> bool:
-    """Check if file is a valid PDF by reading first few bytes and MIME type."""
+def advise_sequential(data) -> None:
+    """Hint the kernel to read a mapped file ahead, front to back (no-op where unsupported)."""
     try:
-        mime_type = get_file_mime_type(file_path)
-        is_pdf_mime = mime_type == 'application/pdf'
-        
-        with open(file_path, 'rb') as file:
-            header = file.read(5)
-            is_pdf_header = header == b'%PDF-'
-            
-        result = is_pdf_mime and is_pdf_header
-        logger.debug(f"PDF validation for {file_path}: MIME={is_pdf_mime}, Header={is_pdf_header}, Result={result}")
-        return result
+        data.madvise(mmap.MADV_SEQUENTIAL)
+        data.madvise(mmap.MADV_WILLNEED)
+    except (AttributeError, OSError):
+        # madvise/MADV_* are missing on Windows and older Pythons
+        pass
+
+def find_last_pdf_object(data, number: int) -> Optional[bytes]:
+    """Find the body of the last plain definition of an object (later updates override earlier ones)."""
+    pattern = re.compile(rb'(?<!\d)%d\s+\d+\s+obj\b(.*?)endobj' % number, re.DOTALL)
+    body = None
+    for match in pattern.finditer(data):
+        body = match.group(1)
+    return body
+
+def get_pdf_root_count_scan(data) -> Optional[int]:
+    """Read the /Count of the /Pages object the last /Root points to, found by scanning."""
+    roots = PDF_ROOT_REF_RE.findall(data)
+    if not roots:
+        return None
+    catalog = find_last_pdf_object(data, int(roots[-1]))
+    pages_ref = PDF_PAGES_REF_RE.search(catalog) if catalog else None
+    pages_node = find_last_pdf_object(data, int(pages_ref.group(1))) if pages_ref else None
+    count = PDF_COUNT_RE.search(pages_node) if pages_node else None
+    return int(count.group(1)) if count else None
+
+def get_pdf_pages_scan(file_path: str, data) -> Optional[int]:
+    """Estimate PDF pages by scanning the raw file data (e.g. an mmap) for the page tree.
+    
+    Follows the last /Root to its /Pages /Count when both are plain objects, else takes
+    the largest /Pages /Count. Without the xref table either can land on a stale or
+    unrelated page tree, so the result is an estimate.
+    """
+    try:
+        logger.debug("Trying page tree scan for %s", file_path)
+        page_count = get_pdf_root_count_scan(data)
+        if page_count is None:
+            # The root /Pages node holds the total, nested nodes hold subtotals
+            counts = [int(before or after) for before, after in PDF_PAGES_COUNT_RE.findall(data)]
+            page_count = max(counts) if counts else len(PDF_PAGE_RE.findall(data))
+        if not page_count:
+            # Page tree is likely inside a compressed object stream
+            logger.debug("Page tree scan found no pages for %s", file_path)
+            return None
+        logger.debug("Page tree scan estimate: %s pages for %s", page_count, file_path)
+        return page_count
+    except Exception as e:
+        logger.error("Page tree scan failed for %s: %s: %s", file_path, type(e).__name__, str(e))
+        return None
+
+class PdfPasswordError(Exception):
+    """The PDF needs a user password, so no parser can read its page tree."""
+
+def get_pdf_pages_pdfium(file_path: str) -> Optional[int]:
+    """Get PDF pages using pypdfium2 (PDFium, compiled)."""
+    if not PYPDFIUM2_AVAILABLE:
+        logger.debug("pypdfium2 not available - skipping PDFium method")
+        return None
         
+    try:
+        logger.debug("Trying PDFium for %s", file_path)
+        import pypdfium2
+        pdf = pypdfium2.PdfDocument(file_path)
+        try:
+            page_count = len(pdf)
+        finally:
+            pdf.close()
+        logger.debug("PDFium success: %s pages for %s", page_count, file_path)
+        return page_count
+    except OSError:
+        raise
     except Exception as e:
-        logger.error(f"Error validating PDF {file_path}: {e}")
-        return False
+        if 'password' in str(e).lower():
+            raise PdfPasswordError(str(e)) from e
+        logger.error("PDFium failed for %s: %s: %s", file_path, type(e).__name__, str(e))
+        logger.debug("PDFium full traceback for %s:", file_path, exc_info=True)
+        return None
 
-def get_pdf_pages_pypdf2(file_path: str) -> Optional[int]:
-    """Get PDF pages using PyPDF2."""
+def get_pdf_pages_pypdf2(file_path: str, file) -> Optional[int]:
+    """Get PDF pages using PyPDF2 on an already open binary file."""
     if not PYPDF2_AVAILABLE:
         logger.debug("PyPDF2 not available - skipping PyPDF2 method")
         return None
         
     try:
-        logger.debug(f"Trying PyPDF2 for {file_path}")
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            page_count = len(pdf_reader.pages)
-            logger.debug(f"PyPDF2 success: {page_count} pages for {file_path}")
-            return page_count
+        logger.debug("Trying PyPDF2 for %s", file_path)
+        import PyPDF2
+        file.seek(0)
+        pdf_reader = PyPDF2.PdfReader(file)
+        page_count = len(pdf_reader.pages)
+        logger.debug("PyPDF2 success: %s pages for %s", page_count, file_path)
+        return page_count
+    except OSError:
+        raise
     except Exception as e:
-        logger.error(f"PyPDF2 failed for {file_path}: {type(e).__name__}: {str(e)}")
-        logger.debug(f"PyPDF2 full traceback for {file_path}:\n{traceback.format_exc()}")
+        logger.error("PyPDF2 failed for %s: %s: %s", file_path, type(e).__name__, str(e))
+        logger.debug("PyPDF2 full traceback for %s:", file_path, exc_info=True)
         return None
 
 def get_pdf_pages_pymupdf(file_path: str) -> Optional[int]:
-    """Get PDF pages using PyMuPDF (fallback)."""
+    """Get PDF pages using PyMuPDF (MuPDF, compiled)."""
     if not PYMUPDF_AVAILABLE:
         logger.debug("PyMuPDF not available")
         return None
     try:
-        logger.debug(f"Trying PyMuPDF for {file_path}")
+        logger.debug("Trying PyMuPDF for %s", file_path)
+        import fitz
         doc = fitz.open(file_path)
-        page_count = len(doc)
-        doc.close()
-        logger.debug(f"PyMuPDF success: {page_count} pages for {file_path}")
+        try:
+            if doc.needs_pass:
+                raise PdfPasswordError("document needs a password")
+            page_count = doc.page_count
+        finally:
+            doc.close()
+        logger.debug("PyMuPDF success: %s pages for %s", page_count, file_path)
         return page_count
+    except (OSError, PdfPasswordError):
+        raise
     except Exception as e:
-        logger.error(f"PyMuPDF failed for {file_path}: {type(e).__name__}: {str(e)}")
-        logger.debug(f"PyMuPDF full traceback for {file_path}:\n{traceback.format_exc()}")
+        logger.error("PyMuPDF failed for %s: %s: %s", file_path, type(e).__name__, str(e))
+        logger.debug("PyMuPDF full traceback for %s:", file_path, exc_info=True)
         return None
 
-def get_pdf_pages_estimate(file_path: str) -> int:
+def get_pdf_pages_estimate(file_path: str, data) -> int:
     """Estimate PDF pages by searching for page objects in raw content."""
     try:
-        logger.debug(f"Trying estimation method for {file_path}")
-        with open(file_path, 'rb') as file:
-            content = file.read(min(1024*1024, os.path.getsize(file_path)))  # Read max 1MB
-            
-        # Count occurrences of page object patterns
-        page_patterns = [b'/Type /Page', b'/Type/Page', b'endobj']
-        pattern_counts = {}
-        
-        for pattern in page_patterns:
-            count = content.count(pattern)
-            if pattern == b'endobj':
-                count = max(1, count // 10)  # Rough estimate
-            pattern_counts[pattern] = count
+        logger.debug("Trying estimation method for %s", file_path)
+        # Count occurrences of page object patterns in one pass over the first 1MB of the mapping
+        found = Counter(PDF_ESTIMATE_RE.findall(data, 0, 1024*1024))
+        pattern_counts = {
+            b'/Type /Page': found[b'/Type /Page'],
+            b'/Type/Page': found[b'/Type/Page'],
+            b'endobj': max(1, found[b'endobj'] // 10),  # Rough estimate
+        }
             
         max_count = max(pattern_counts.values()) if pattern_counts else 1
         estimated_pages = max(1, min(max_count, 1000))  # Cap at reasonable number
         
-        logger.debug(f"Pattern counts for {file_path}: {pattern_counts}")
-        logger.debug(f"Estimated {estimated_pages} pages for {file_path}")
+        logger.debug("Pattern counts for %s: %s", file_path, pattern_counts)
+        logger.debug("Estimated %s pages for %s", estimated_pages, file_path)
         return estimated_pages
         
     except Exception as e:
-        logger.error(f"Estimation failed for {file_path}: {type(e).__name__}: {str(e)}")
+        logger.error("Estimation failed for %s: %s: %s", file_path, type(e).__name__, str(e))
         return 1
 
-def should_process_as_pdf(file_path: str) -> bool:
-    """Determine if file should be processed as PDF based on extension AND content."""
+def should_process_as_pdf(file_path: str, header: bytes) -> bool:
+    """Determine if file should be processed as PDF based on extension AND header bytes."""
     # Only check files with .pdf extension
     if not file_path.lower().endswith('.pdf'):
         return False
         
-    # Check if it's actually a PDF file
-    mime_type = get_file_mime_type(file_path)
-    is_actually_pdf = is_valid_pdf(file_path)
+    # Check if it's actually a PDF file; for a .pdf name the MIME type adds nothing
+    is_actually_pdf = header[:5] == b'%PDF-'
     
-    logger.debug(f"PDF check for {file_path}: extension=.pdf, mime={mime_type}, valid_pdf={is_actually_pdf}")
+    logger.debug("PDF check for %s: extension=.pdf, header=%s, valid_pdf=%s", file_path, header[:8], is_actually_pdf)
     
     if not is_actually_pdf:
-        logger.warning(f"File {file_path} has .pdf extension but is not a valid PDF (MIME: {mime_type})")
+        logger.warning("File %s has .pdf extension but is not a valid PDF (header: %s)", file_path, header[:8])
         return False
         
     return True
 
-def get_pdf_pages(file_path: str) -> int:
-    """Get number of pages in a PDF file with comprehensive error handling."""
-    logger.info(f"Processing PDF: {file_path}")
+def get_pdf_pages(file_path: str) -> Tuple[int, str]:
+    """Get number of pages in a PDF file with comprehensive error handling.
     
-    # First check if we should even try to process as PDF
-    if not should_process_as_pdf(file_path):
-        logger.warning(f"Skipping PDF processing for {file_path} - not a valid PDF")
-        return 1
+    Returns (pages, method): method is one of EXACT_PAGE_METHODS, or 'scan',
+    'estimate' or 'fallback' for counts that are only a guess.
+    """
+    logger.info("Processing PDF: %s", file_path)
     
-    # Try PyPDF2 first
     try:
-        pages = get_pdf_pages_pypdf2(file_path)
+        # Open once: the page tree scan, validation, PyPDF2 and the estimate share it
+        with open(file_path, 'rb') as file:
+            try:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped and are not PDFs either
+                logger.warning("Skipping PDF processing for %s - not a valid PDF", file_path)
+                return 1, 'fallback'
+            
+            with data:
+                # Identical copies of a PDF (common in case files) are only counted once
+                key = pdf_fingerprint(data)
+                result = PAGE_COUNT_CACHE.get(key)
+                if result is not None:
+                    logger.info("Reusing the page count of an identical PDF for %s: %s pages", file_path, result[0])
+                    return result
+                
+                result = count_pdf_pages(file_path, file, data)
+                if len(PAGE_COUNT_CACHE) < PAGE_COUNT_CACHE_SIZE:
+                    PAGE_COUNT_CACHE[key] = result
+                return result
+    except OSError as e:
+        logger.error("Cannot read PDF %s: %s", file_path, e)
+        return 1, 'fallback'
+
+def pdf_fingerprint(data) -> Tuple[int, bytes]:
+    """Identify PDF content by its size and a hash of its first and last 4KB."""
+    # The head holds the header and often the first objects, the tail the
+    # xref table and trailer (with the document /ID)
+    digest = hashlib.blake2b(data[:4096], digest_size=16)
+    digest.update(data[-4096:])
+    return len(data), digest.digest()
+
+def count_pdf_pages(file_path: str, file, data) -> Tuple[int, str]:
+    """Try each page counting method in turn on an open PDF and its mmap.
+    
+    Returns (pages, method) like get_pdf_pages.
+    """
+    # Read the page tree root's /Count through the xref table, touching only a few objects
+    try:
+        pages = get_pdf_pages_trailer(file_path, data)
         if pages is not None:
-            logger.info(f"Successfully extracted {pages} pages from {file_path} using PyPDF2")
-            return pages
+            logger.info("Successfully extracted %s pages from %s using trailer lookup", pages, file_path)
+            return pages, 'trailer'
     except Exception as e:
-        logger.error(f"Unexpected error in PyPDF2 processing for {file_path}: {e}")
+        logger.error("Unexpected error in trailer lookup for %s: %s", file_path, e)
     
-    # Try PyMuPDF as fallback
+    # Hand PDFs without a usable xref table to the parsers (PDFium first); the header
+    # is checked once here so files that are not PDFs never reach them
+    is_pdf = should_process_as_pdf(file_path, data[:8])
+    if is_pdf:
+        # The parsers all read the same bytes: when one finds the file password protected
+        # or unreadable, the others cannot do better, so skip the remaining ones
+        try:
+            result = parse_pdf_pages(file_path, file)
+            if result is not None:
+                return result
+        except PdfPasswordError as e:
+            logger.warning("PDF %s is password protected, skipping the remaining parsers: %s", file_path, e)
+        except OSError as e:
+            logger.error("Cannot read PDF %s, skipping the remaining parsers: %s", file_path, e)
+    
+    # Scan the whole file for the page tree when no parser could count the pages; it
+    # can pick up stale or unrelated page tree nodes, so its count is only an estimate
+    advise_sequential(data)
     try:
-        pages = get_pdf_pages_pymupdf(file_path)
+        pages = get_pdf_pages_scan(file_path, data)
         if pages is not None:
-            logger.info(f"Successfully extracted {pages} pages from {file_path} using PyMuPDF (fallback)")
-            return pages
+            logger.warning("Using page tree scan estimate for %s: %s pages", file_path, pages)
+            return pages, 'scan'
     except Exception as e:
-        logger.error(f"Unexpected error in PyMuPDF processing for {file_path}: {e}")
+        logger.error("Unexpected error in page tree scan for %s: %s", file_path, e)
+    
+    if not is_pdf:
+        logger.warning("Skipping PDF processing for %s - not a valid PDF", file_path)
+        return 1, 'fallback'
     
     # Last resort: estimate based on file content
     try:
-        pages = get_pdf_pages_estimate(file_path)
-        logger.warning(f"Using estimation method for {file_path}: {pages} pages")
-        return pages
+        pages = get_pdf_pages_estimate(file_path, data)
+        logger.warning("Using estimation method for %s: %s pages", file_path, pages)
+        return pages, 'estimate'
     except Exception as e:
-        logger.error(f"All PDF processing methods failed for {file_path}: {e}")
-        logger.error(f"Final fallback traceback:\n{traceback.format_exc()}")
-        return 1
+        logger.error("All PDF processing methods failed for %s: %s", file_path, e)
+        logger.error("Final fallback traceback:\n%s", traceback.format_exc())
+        return 1, 'fallback'
+
+
+def parse_pdf_pages(file_path: str, file) -> Optional[Tuple[int, str]]:
+    """Count pages with the installed PDF parsers, compiled ones first.
+    
+    Returns (pages, method) from the first parser that can open the file.
+    Raises PdfPasswordError or OSError when a parser shows that none of them can read the file.
+    """
+    # Parse files the scan cannot read (e.g. compressed object streams) with PDFium
+    try:
+        pages = get_pdf_pages_pdfium(file_path)
+        if pages is not None:
+            logger.info("Successfully extracted %s pages from %s using PDFium", pages, file_path)
+            return pages, 'pdfium'
+    except (OSError, PdfPasswordError):
+        raise
+    except Exception as e:
+        logger.error("Unexpected error in PDFium processing for %s: %s", file_path, e)
+    
+    # Try PyMuPDF (MuPDF, compiled) when pypdfium2 is missing or cannot open the file
+    try:
+        pages = get_pdf_pages_pymupdf(file_path)
+        if pages is not None:
+            logger.info("Successfully extracted %s pages from %s using PyMuPDF", pages, file_path)
+            return pages, 'pymupdf'
+    except (OSError, PdfPasswordError):
+        raise
+    except Exception as e:
+        logger.error("Unexpected error in PyMuPDF processing for %s: %s", file_path, e)
+    
+    # Pure-Python PyPDF2 as the last parser
+    try:
+        pages = get_pdf_pages_pypdf2(file_path, file)
+        if pages is not None:
+            logger.info("Successfully extracted %s pages from %s using PyPDF2", pages, file_path)
+            return pages, 'pypdf2'
+    except (OSError, PdfPasswordError):
+        raise
+    except Exception as e:
+        logger.error("Unexpected error in PyPDF2 processing for %s: %s", file_path, e)
+    
+    return None
+
+
+@functools.lru_cache(maxsize=64)
+def get_file_format(extension: str) -> str:
+    """Get the format label for an extension like '.pdf' (cached, extensions repeat)."""
+    return extension[1:].upper() if extension else "UNKNOWN"
 
 
-def get_file_size(file_path: str) -> str:
+def get_file_size(file_stat: os.stat_result) -> str:
     """Get file size formatted as KB or MB."""
     try:
-        size_bytes = os.path.getsize(file_path)
+        size_bytes = file_stat.st_size
         if size_bytes < 1024:
             return f"{size_bytes} bytes"
         elif size_bytes < 1024 * 1024:
-            size_kb = size_bytes / 1024
-            return f"{size_kb:.1f} KB".replace('.', ',')
+            # Round in integers and join with the decimal comma directly
+            # (same half-even rounding as :.1f, no .replace('.', ','))
+            tenths = round(size_bytes * 10 / 1024)
+            return f"{tenths // 10},{tenths % 10} KB"
         else:
-            size_mb = size_bytes / (1024 * 1024)
-            return f"{size_mb:.2f} MB".replace('.', ',')
+            hundredths = round(size_bytes * 100 / (1024 * 1024))
+            return f"{hundredths // 100},{hundredths % 100:02d} MB"
     except Exception:
         return "0 bytes"
 
@@ -406,49 +765,226 @@ def get_file_size(file_path: str) -> str:
 def count_files_in_directory(dir_path: str) -> int:
     """Count number of files in a directory."""
     try:
-        return len([f for f in os.listdir(dir_path) if os.path.isfile(os.path.join(dir_path, f))])
+        with os.scandir(dir_path) as entries:
+            return sum(1 for entry in entries if entry.is_file())
     except Exception:
         return 0
 
 
-def get_creation_date(file_path: str) -> str:
-    """Get file creation date formatted as Spanish date."""
+def format_spanish_date(t: time.struct_time) -> str:
+    """Format a local time as Spanish date: d/mm/yyyy h:mm a. m./p. m."""
+    hour = t.tm_hour
+    return f"{t.tm_mday}/{t.tm_mon:02d}/{t.tm_year} {HOUR_12[hour]}:{t.tm_min:02d} {AM_PM[hour]}"
+
+
+def get_creation_date(file_stat: Optional[os.stat_result]) -> str:
+    """Get file creation date formatted as Spanish date (now if stat is unavailable)."""
     try:
-        stat = os.stat(file_path)
         # Use birth time if available (macOS), otherwise use modification time
-        creation_time = getattr(stat, 'st_birthtime', stat.st_mtime)
-        dt = datetime.fromtimestamp(creation_time)
-        # Format as Spanish date: d/mm/yyyy h:mm a. m./p. m.
-        am_pm = "a. m." if dt.hour < 12 else "p. m."
-        hour_12 = dt.hour if dt.hour <= 12 else dt.hour - 12
-        if hour_12 == 0:
-            hour_12 = 12
-        return f"{dt.day}/{dt.month:02d}/{dt.year} {hour_12}:{dt.minute:02d} {am_pm}"
+        creation_time = getattr(file_stat, 'st_birthtime', file_stat.st_mtime)
+        return format_spanish_date(time.localtime(creation_time))
     except Exception:
-        dt = datetime.now()
-        am_pm = "a. m." if dt.hour < 12 else "p. m."
-        hour_12 = dt.hour if dt.hour <= 12 else dt.hour - 12
-        if hour_12 == 0:
-            hour_12 = 12
-        return f"{dt.day}/{dt.month:02d}/{dt.year} {hour_12}:{dt.minute:02d} {am_pm}"
+        return format_spanish_date(time.localtime())
 
 
-def get_ordered_files(directory: str) -> List[Tuple[str, str]]:
+def get_ordered_files(directory: str) -> List[os.DirEntry]:
     """Get files and directories ordered by their numeric prefix."""
-    items = []
+    # Sort by the numeric prefix extracted from filename; keys are computed once
+    # and the listing index keeps ties in directory order (like a stable sort)
+    with os.scandir(directory) as entries:
+        decorated = [(extract_number_from_filename(entry.name), index, entry)
+                     for index, entry in enumerate(entries)]
+    decorated.sort()
     
-    for item in os.listdir(directory):
-        item_path = os.path.join(directory, item)
-        items.append((item, item_path))
+    return [entry for _, _, entry in decorated]
+
+
+def get_entry_info(entry: os.DirEntry) -> Tuple[str, str, Optional[str], Optional[os.stat_result]]:
+    """Get name, path, kind ('file'/'dir') and stat of an entry from the scandir cache."""
+    try:
+        entry_stat = entry.stat()
+    except OSError:
+        # Broken symlink or entry removed since the directory was read
+        return entry.name, entry.path, None, None
     
-    # Sort by the numeric prefix extracted from filename
-    items.sort(key=lambda x: extract_number_from_filename(x[0]))
+    if entry.is_file():
+        kind = 'file'
+    elif entry.is_dir():
+        kind = 'dir'
+    else:
+        kind = None
+    return entry.name, entry.path, kind, entry_stat
+
+
+def extract_row(item_name: str, item_path: str, kind: Optional[str],
+                item_stat: Optional[os.stat_result], known_pages: Optional[tuple] = None) -> dict:
+    """Extract the metadata of a single item (runs in a worker process).
+    
+    known_pages is a (pages, method) pair from the on-disk cache; the PDF is not
+    read again. The row's pages_method tells how its page count was obtained.
+    """
+    row = {
+        'name': item_name,
+        'creation_date': get_creation_date(item_stat),
+        'kind': None,
+        'pages': None,
+        'pages_method': None,
+        'format': None,
+        'size': None,
+    }
+    
+    if kind == 'file':
+        # Process pages
+        try:
+            if known_pages is not None:
+                pages, row['pages_method'] = known_pages
+                logger.debug("Cached page count for %s: %s (%s)", item_path, pages, row['pages_method'])
+            elif item_path.lower().endswith('.pdf'):
+                logger.info("Processing potential PDF: %s", item_path)
+                pages, row['pages_method'] = get_pdf_pages(item_path)
+            else:
+                pages = 1
+                logger.debug("Non-PDF file: %s, setting pages = 1", item_path)
+        except Exception as e:
+            logger.error("Error processing file %s for page count: %s", item_path, e)
+            logger.error("Stack trace:\n%s", traceback.format_exc())
+            pages = 1  # Fallback
+        
+        # File format and size
+        row.update({
+            'kind': 'file',
+            'pages': pages,
+            'format': get_file_format(os.path.splitext(item_name)[1]),
+            'size': get_file_size(item_stat),
+        })
+        
+    elif kind == 'dir':
+        # For directories
+        file_count = count_files_in_directory(item_path)
+        row.update({
+            'kind': 'dir',
+            'pages': 1,  # Directories count as 1 page
+            'format': "CARPETA",
+            'size': f"{file_count} archivos",
+        })
     
-    return items
+    return row
 
+def init_worker(status: dict, log_level: int, log_file: Optional[str] = None):
+    """Load dependencies and logging setup in a worker process."""
+    load_dependencies(status)
+    logger.setLevel(log_level)
+    logging.getLogger().setLevel(log_level)
+    # Forked workers inherit the --log-file handler; spawned ones (Windows, macOS)
+    # start from a fresh import and append to the file themselves
+    if log_file is not None and get_log_file() is None:
+        add_log_file(log_file)
 
+def page_cache_key(item_path: str, item_stat: os.stat_result) -> str:
+    """Key a PDF page count by absolute path, size and modification time."""
+    return f"{os.path.abspath(item_path)}|{item_stat.st_size}|{item_stat.st_mtime_ns}"
+
+def load_page_cache() -> dict:
+    """Load the page count cache shared between runs (empty if missing or unreadable).
+    
+    Entries not counted by one of EXACT_PAGE_METHODS are dropped.
+    """
+    try:
+        with open(PAGE_CACHE_FILE, encoding='utf-8') as file:
+            data = json.load(file)
+    except (OSError, ValueError) as e:
+        logger.debug("Page count cache unavailable: %s", e)
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {key: (entry[0], entry[1]) for key, entry in data.items()
+            if isinstance(entry, list) and len(entry) == 2
+            and type(entry[0]) is int and entry[0] > 0 and entry[1] in EXACT_PAGE_METHODS}
+
+def save_page_cache(cache: dict):
+    """Replace the page count cache file atomically, keeping the most recently used entries."""
+    entries = list(cache.items())[-PAGE_CACHE_MAX_ENTRIES:]
+    try:
+        # Concurrent runs each write a whole file; the last one to finish wins
+        fd, temp_path = tempfile.mkstemp(dir=make_cache_dir(), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(dict(entries), file)
+            os.replace(temp_path, PAGE_CACHE_FILE)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError as e:
+        logger.debug("Page count cache update failed: %s", e)
+
+def extract_rows(ordered_items: List[os.DirEntry]) -> Iterator[dict]:
+    """Extract metadata for all items, yielding rows in order as they are ready.
+    
+    Page counts of unchanged PDFs are taken from the on-disk cache; new ones read
+    from the page tree are stored with their method once all rows are out. Only this process touches the cache.
+    """
+    cache = load_page_cache()
+    items = []
+    keys = []
+    for entry in ordered_items:
+        item_name, item_path, kind, item_stat = get_entry_info(entry)
+        key = None
+        known_pages = None
+        if kind == 'file' and item_path.lower().endswith('.pdf'):
+            key = page_cache_key(item_path, item_stat)
+            known_pages = cache.pop(key, None)
+            if known_pages is not None:
+                # Re-inserted so it counts as recently used
+                cache[key] = known_pages
+        items.append((item_name, item_path, kind, item_stat, known_pages))
+        keys.append(key)
+    
+    try:
+        for key, row in zip(keys, map_rows(items)):
+            # Fallback counts and estimates are left out, so they are retried next run
+            if key is not None and row['pages_method'] in EXACT_PAGE_METHODS:
+                cache[key] = (row['pages'], row['pages_method'])
+            yield row
+    finally:
+        if any(keys):
+            save_page_cache(cache)
+
+def map_rows(items: List[tuple], mp_context=None) -> Iterator[dict]:
+    """Run extract_row over the items in parallel, yielding rows in order as they are ready.
+    
+    Only PDFs without a cached page count need real work; with fewer than
+    PARALLEL_MIN_PDFS of them, or a single CPU, everything runs in this process.
+    mp_context selects the worker start method (the platform default if None).
+    """
+    pending_pdfs = sum(1 for _, item_path, kind, _, known_pages in items
+                       if kind == 'file' and known_pages is None and item_path.lower().endswith('.pdf'))
+    # Windows caps process pools at 61 workers
+    max_workers = min(os.cpu_count() or 1, pending_pdfs, 61)
+    if pending_pdfs < PARALLEL_MIN_PDFS or max_workers < 2:
+        yield from (extract_row(*item) for item in items)
+        return
+    done = 0
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 mp_context=mp_context,
+                                 initializer=init_worker,
+                                 initargs=(DEPENDENCY_STATUS, logger.getEffectiveLevel(),
+                                           get_log_file())) as executor:
+            # The caller writes each row while the workers keep counting later files;
+            # DirEntry objects cannot be pickled, so workers get the cached values instead
+            for row in executor.map(extract_row, *zip(*items), chunksize=8):
+                yield row
+                done += 1
+    except (OSError, NotImplementedError, BrokenProcessPool) as e:
+        logger.warning("Parallel processing unavailable (%s), processing remaining files serially", e)
+        yield from (extract_row(*item) for item in items[done:])
+
+
+@functools.lru_cache(maxsize=None)
 def setup_excel_formatting():
-    """Setup Excel formatting styles."""
+    """Setup Excel formatting styles (built once per process, shared by every workbook)."""
+    from openpyxl.styles import Font, Alignment, Border, Side
+    
     # Header font and style
     header_font = Font(name='Calibri', size=11, bold=True)
     header_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
@@ -457,81 +993,76 @@ def setup_excel_formatting():
     data_font = Font(name='Calibri', size=11)
     data_alignment = Alignment(vertical='center', wrap_text=True)
     
-    # Border style
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
+    # Border style (one Side instance shared by all four edges)
+    thin = Side(style='thin')
+    thin_border = Border(left=thin, right=thin, top=thin, bottom=thin)
     
     return header_font, header_alignment, data_font, data_alignment, thin_border
 
-def add_headers_and_formatting(ws, directory: str = "", litigant_name: str = ""):
-    """Add headers and formatting to match the template."""
+def add_named_styles(wb):
+    """Register the header and data cell styles on the workbook."""
+    from openpyxl.styles import NamedStyle
+    
     header_font, header_alignment, data_font, data_alignment, thin_border = setup_excel_formatting()
+    wb.add_named_style(NamedStyle(name='header', font=header_font,
+                                  alignment=header_alignment, border=thin_border))
+    wb.add_named_style(NamedStyle(name='data', font=data_font,
+                                  alignment=data_alignment, border=thin_border))
+
+def styled_cell(ws, value, style: str):
+    """Create a write-only cell using a registered named style."""
+    from openpyxl.cell import WriteOnlyCell
     
+    cell = WriteOnlyCell(ws, value=value)
+    cell.style = style
+    return cell
+
+def columns_to_row(cells: dict) -> list:
+    """Convert {'A': value, 'H': value} into a positional row for ws.append."""
+    row = [None] * (max(ord(col) for col in cells) - ord('A') + 1)
+    for col, value in cells.items():
+        row[ord(col) - ord('A')] = value
+    return row
+
+def add_headers_and_formatting(ws, directory: str = "", litigant_name: str = ""):
+    """Append the template header rows (1-11) to a write-only worksheet."""
     # Add document header information to match indice de ejemplo format
-    # Row 1: Ciudad
-    ws['A1'].value = 'Ciudad'
-    ws['B1'].value = 'SANTIAGO DE CALI (VALLE)'
-    ws['H1'].value = 'EXPEDIENTE FÍSICO'
-    
-    # Row 2: Despacho Judicial (Judge)
-    ws['A2'].value = 'Despacho Judicial'
-    ws['B2'].value = 'JUZGADO DECIMO LABORALDEL  CIRCUITO DE CALI'  # Standard judge format
-    ws['H2'].value = 'El expediente judicial posee documentos físicos:'
-    ws['J2'].value = 'SI     NO X'
-    
-    # Row 3: Serie
-    ws['A3'].value = 'Serie o Subserie Documental'
-    ws['B3'].value = 'ORDINARIO LABORAL DE PRIMERA INSTANCIA'
-    
-    # Row 4: Radicación  
-    ws['A4'].value = 'No. Radicación del Proceso'
-    ws['B4'].value = '76001310501020230040100'  # Standard format, could be made configurable
-    ws['H4'].value = 'No. de carpetas (cuadernos), legajos o tomos:'
-    
-    # Row 5: Demandado
-    ws['A5'].value = 'Partes Procesales (Parte A)\n(demandado, procesado, accionado)'
-    ws['B5'].value = 'PORVENIR Y OTROS'  # Standard format
-    ws['H5'].value = 'No. de carpetas (cuadernos), legajos o tomos digitalizados:'
-    
-    # Row 6: Demandante (Litigant)
-    ws['A6'].value = 'Partes Procesales (Parte B)\n(demandante, denunciante, accionante)'
-    ws['B6'].value = litigant_name.upper() if litigant_name else 'NOMBRE DEL LITIGANTE'
-    
-    # Row 7: Terceros
-    ws['A7'].value = 'Terceros Intervinientes'
-    
-    # Row 8: Cuaderno
-    ws['A8'].value = 'Cuaderno '
-    
-    # Row 10: Main title
-    ws['A10'].value = 'ÍNDICE ELECTRÓNICO DEL EXPEDIENTE JUDICIAL'
-    
-    # Headers in Spanish (row 11)
-    headers = {
-        'A11': 'Nombre Documento',
-        'B11': 'Fecha Creación Documento', 
-        'C11': 'Fecha Incorporación Expediente',
-        'D11': 'Orden Documento',
-        'E11': 'Número Páginas',
-        'F11': 'Página Inicio',
-        'G11': 'Página Fin',
-        'H11': 'Formato',
-        'I11': 'Tamaño',
-        'J11': 'Origen',
-        'K11': 'Observaciones'
-    }
+    header_rows = [
+        # Row 1: Ciudad
+        {'A': 'Ciudad', 'B': 'SANTIAGO DE CALI (VALLE)', 'H': 'EXPEDIENTE FÍSICO'},
+        # Row 2: Despacho Judicial (Judge)
+        {'A': 'Despacho Judicial',
+         'B': 'JUZGADO DECIMO LABORALDEL  CIRCUITO DE CALI',  # Standard judge format
+         'H': 'El expediente judicial posee documentos físicos:',
+         'J': 'SI     NO X'},
+        # Row 3: Serie
+        {'A': 'Serie o Subserie Documental', 'B': 'ORDINARIO LABORAL DE PRIMERA INSTANCIA'},
+        # Row 4: Radicación
+        {'A': 'No. Radicación del Proceso',
+         'B': '76001310501020230040100',  # Standard format, could be made configurable
+         'H': 'No. de carpetas (cuadernos), legajos o tomos:'},
+        # Row 5: Demandado
+        {'A': 'Partes Procesales (Parte A)\n(demandado, procesado, accionado)',
+         'B': 'PORVENIR Y OTROS',  # Standard format
+         'H': 'No. de carpetas (cuadernos), legajos o tomos digitalizados:'},
+        # Row 6: Demandante (Litigant)
+        {'A': 'Partes Procesales (Parte B)\n(demandante, denunciante, accionante)',
+         'B': litigant_name.upper() if litigant_name else 'NOMBRE DEL LITIGANTE'},
+        # Row 7: Terceros
+        {'A': 'Terceros Intervinientes'},
+        # Row 8: Cuaderno
+        {'A': 'Cuaderno '},
+        # Row 9: blank
+        {},
+        # Row 10: Main title
+        {'A': 'ÍNDICE ELECTRÓNICO DEL EXPEDIENTE JUDICIAL'},
+    ]
+    
+    for cells in header_rows:
+        ws.append(columns_to_row(cells) if cells else [])
     
-    # Add headers with formatting
-    for cell_ref, header_text in headers.items():
-        cell = ws[cell_ref]
-        cell.value = header_text
-        cell.font = header_font
-        cell.alignment = header_alignment
-        cell.border = thin_border
+    # Add headers with formatting (row 11)
+    ws.append([styled_cell(ws, header_text, 'header') for header_text in EXCEL_HEADERS])
 
 def check_file_permissions(file_path: str) -> bool:
     """Check if we can write to the specified file path."""
@@ -544,7 +1075,7 @@ def check_file_permissions(file_path: str) -> bool:
         directory = os.path.dirname(file_path) or '.'
         return os.access(directory, os.W_OK)
     except Exception as e:
-        logger.error(f"Error checking permissions for {file_path}: {e}")
+        logger.error("Error checking permissions for %s: %s", file_path, e)
         return False
 
 def create_safe_filename(base_name: str) -> str:
@@ -558,19 +1089,26 @@ def create_safe_filename(base_name: str) -> str:
     timestamped_name = f"{name}_{timestamp}{ext}"
     
     if check_file_permissions(timestamped_name):
-        logger.info(f"Using timestamped filename: {timestamped_name}")
+        logger.info("Using timestamped filename: %s", timestamped_name)
         return timestamped_name
     
     # Fall back to temp directory
     temp_dir = tempfile.gettempdir()
     temp_name = os.path.join(temp_dir, os.path.basename(timestamped_name))
-    logger.warning(f"Using temp directory: {temp_name}")
+    logger.warning("Using temp directory: %s", temp_name)
     return temp_name
 
-def export_to_csv(data: List[dict], csv_file: str) -> bool:
-    """Export data to CSV format."""
+def xl_to_csv(file_name: str) -> str:
+    """Return the CSV counterpart of an Excel output filename."""
+    return XL_EXT_RE.sub('.csv', file_name)
+
+def export_to_csv(data: List[tuple], csv_file: str) -> Optional[str]:
+    """Export data rows (tuples in CSV_HEADERS order) to CSV format.
+    
+    Returns the path actually written (see create_safe_filename), or None on failure.
+    """
     try:
-        logger.info(f"Exporting to CSV: {csv_file}")
+        logger.info("Exporting to CSV: %s", csv_file)
         
         # Create safe filename
         safe_csv_file = create_safe_filename(csv_file)
@@ -578,30 +1116,36 @@ def export_to_csv(data: List[dict], csv_file: str) -> bool:
         with open(safe_csv_file, 'w', newline='', encoding='utf-8') as file:
             if not data:
                 logger.warning("No data to export to CSV")
-                return False
+                return None
                 
-            writer = csv.DictWriter(file, fieldnames=data[0].keys())
-            writer.writeheader()
+            writer = csv.writer(file)
+            writer.writerow(CSV_HEADERS)
             writer.writerows(data)
             
-        logger.info(f"CSV export successful: {safe_csv_file}")
+        logger.info("CSV export successful: %s", safe_csv_file)
         print(f"CSV file created: {safe_csv_file}")
-        return True
+        return safe_csv_file
         
     except Exception as e:
-        logger.error(f"CSV export failed: {e}")
-        logger.error(f"CSV export traceback:\n{traceback.format_exc()}")
-        return False
+        logger.error("CSV export failed: %s", e)
+        logger.error("CSV export traceback:\n%s", traceback.format_exc())
+        return None
 
-def process_files_to_excel(directory: str, output_file: str = "metadata_output.xlsx", export_csv: bool = False, litigant_name: str = ""):
-    """Process files and write metadata to Excel file matching the template format."""
+def process_files_to_excel(directory: str, output_file: str = "metadata_output.xlsx", export_csv: bool = False, litigant_name: str = "") -> dict:
+    """Process files and write metadata to Excel file matching the template format.
+    
+    Returns the paths actually written, {'excel': ..., 'csv': ...} (None when not
+    written), and 'csv_fallback', True when CSV was written instead of the Excel file.
+    """
+    result = {'excel': None, 'csv': None, 'csv_fallback': False}
     
     # Check if we can create Excel files
     if not OPENPYXL_AVAILABLE and not export_csv and not output_file.endswith('.csv'):
         logger.error("Cannot create Excel files - openpyxl not available. Switching to CSV output.")
         print("[WARNING] Switching to CSV output due to missing dependencies")
-        output_file = output_file.replace('.xlsx', '.csv').replace('.xlsm', '.csv')
+        output_file = xl_to_csv(output_file)
         export_csv = True
+        result['csv_fallback'] = True
     
     # Get ordered files
     ordered_items = get_ordered_files(directory)
@@ -610,141 +1154,67 @@ def process_files_to_excel(directory: str, output_file: str = "metadata_output.x
     wb = None
     ws = None
     if OPENPYXL_AVAILABLE and not output_file.endswith('.csv'):
-        # Create new workbook (always start fresh to match template)
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Indice Electrónico"
+        # Create new write-only workbook (always start fresh to match template);
+        # rows are streamed to disk as they are appended
+        from openpyxl import Workbook
+        
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Indice Electrónico")
+        
+        # Cells reference these by name instead of carrying font/alignment/border each
+        add_named_styles(wb)
+        
+        # Column widths must be set before the first row is appended
+        for col, width in COLUMN_WIDTHS.items():
+            ws.column_dimensions[col].width = width
     
     # Add headers and formatting (only for Excel)
     if ws is not None:
         add_headers_and_formatting(ws, directory, litigant_name)
     
-    # Setup Excel formatting (only if needed)
-    header_font, header_alignment, data_font, data_alignment, thin_border = None, None, None, None, None
-    if ws is not None:
-        header_font, header_alignment, data_font, data_alignment, thin_border = setup_excel_formatting()
-    
-    # Starting row for data (A12 as specified)
-    start_row = 12
+    # Data rows are appended right after the headers (A12 as specified)
     current_page = 1  # Track page numbering
     
     # Collect all data first (works with or without Excel)
     data_rows = []
     
-    for idx, (item_name, item_path) in enumerate(ordered_items):
-        current_row = start_row + idx
+    # Extract metadata in worker processes; the workbook stays in this process
+    # and rows are written as soon as they arrive
+    for idx, row in enumerate(extract_rows(ordered_items)):
+        item_name = row['name']
         
-        # Collect data for this item
-        creation_date_str = get_creation_date(item_path)
-        row_data = {
-            'Nombre Documento': item_name,
-            'Fecha Creación Documento': creation_date_str,
-            'Fecha Incorporación Expediente': creation_date_str,
-            'Orden Documento': idx + 1,
-            'Página Inicio': current_page,
-        }
+        # Collect data for this item, in CSV_HEADERS order
+        creation_date_str = row['creation_date']
+        row_data = (item_name, creation_date_str, creation_date_str, idx + 1, current_page)
         
-        # Write to Excel if available
-        if ws is not None:
-            ws[f'A{current_row}'].value = item_name
-            ws[f'B{current_row}'].value = creation_date_str
-            ws[f'C{current_row}'].value = creation_date_str
-            ws[f'D{current_row}'].value = idx + 1
+        # Excel row values, columns A to K
+        row_values = [item_name, creation_date_str, creation_date_str, idx + 1]
         
-        if os.path.isfile(item_path):
-            # Process pages
-            try:
-                if item_path.lower().endswith('.pdf'):
-                    logger.info(f"Processing potential PDF: {item_path}")
-                    pages = get_pdf_pages(item_path)
-                else:
-                    pages = 1
-                    logger.debug(f"Non-PDF file: {item_path}, setting pages = 1")
-            except Exception as e:
-                logger.error(f"Error processing file {item_path} for page count: {e}")
-                logger.error(f"Stack trace:\n{traceback.format_exc()}")
-                pages = 1  # Fallback
-            
-            # File format and size
-            file_ext = os.path.splitext(item_path)[1].upper().lstrip('.')
-            file_size = get_file_size(item_path)
+        if row['kind'] is not None:
+            pages = row['pages']
             
             # Update row data
-            row_data.update({
-                'Número Páginas': pages,
-                'Página Fin': current_page + pages - 1,
-                'Formato': file_ext if file_ext else "UNKNOWN",
-                'Tamaño': file_size,
-                'Origen': "ELECTRONICO",
-                'Observaciones': ""
-            })
+            row_data += (pages, current_page + pages - 1, row['format'], row['size'], "ELECTRONICO", "")
             
-            # Write to Excel if available
-            if ws is not None:
-                ws[f'E{current_row}'].value = pages
-                ws[f'F{current_row}'].value = current_page
-                ws[f'G{current_row}'].value = f"=F{current_row}+E{current_row}-1"
-                ws[f'H{current_row}'].value = file_ext if file_ext else "UNKNOWN"
-                ws[f'I{current_row}'].value = file_size
-                ws[f'J{current_row}'].value = "ELECTRONICO"
+            if row['kind'] == 'dir':
+                page_end = current_page  # Same start and end for directories
+            else:
+                page_end = current_page + pages - 1  # Literal value, no formula to recalculate
+            row_values += [pages, current_page, page_end, row['format'], row['size'], "ELECTRONICO"]
             
             # Update page counter for next file
             current_page += pages
-            
-        elif os.path.isdir(item_path):
-            # For directories
-            file_count = count_files_in_directory(item_path)
-            
-            # Update row data
-            row_data.update({
-                'Número Páginas': 1,
-                'Página Fin': current_page,
-                'Formato': "CARPETA",
-                'Tamaño': f"{file_count} archivos",
-                'Origen': "ELECTRONICO",
-                'Observaciones': ""
-            })
-            
-            # Write to Excel if available
-            if ws is not None:
-                ws[f'E{current_row}'].value = 1  # Directories count as 1 page
-                ws[f'F{current_row}'].value = current_page
-                ws[f'G{current_row}'].value = current_page  # Same start and end for directories
-                ws[f'H{current_row}'].value = "CARPETA"
-                ws[f'I{current_row}'].value = f"{file_count} archivos"
-                ws[f'J{current_row}'].value = "ELECTRONICO"
-            
-            current_page += 1
+        else:
+            # Unreadable entry: leave the page and file columns empty in the CSV too
+            row_data += ("",) * 6
         
         # Add row to data collection
         data_rows.append(row_data)
         
-        # Apply formatting to all data cells (Excel only)
-        if ws is not None and header_font is not None:
-            for col in ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K']:
-                cell = ws[f'{col}{current_row}']
-                cell.font = data_font
-                cell.alignment = data_alignment
-                cell.border = thin_border
-    
-    # Adjust column widths (Excel only)
-    if ws is not None:
-        column_widths = {
-            'A': 25,  # Nombre Documento
-            'B': 18,  # Fecha Creación
-            'C': 18,  # Fecha Incorporación  
-            'D': 8,   # Orden
-            'E': 10,  # Número Páginas
-            'F': 10,  # Página Inicio
-            'G': 10,  # Página Fin
-            'H': 12,  # Formato
-            'I': 15,  # Tamaño
-            'J': 12,  # Origen
-            'K': 20   # Observaciones
-        }
-        
-        for col, width in column_widths.items():
-            ws.column_dimensions[col].width = width
+        # Write the formatted row, padding the remaining columns up to K (Excel only)
+        if ws is not None:
+            row_values += [None] * (11 - len(row_values))
+            ws.append([styled_cell(ws, value, 'data') for value in row_values])
     
     # Use collected data for CSV export (works with or without Excel)
     csv_data = data_rows if export_csv or output_file.endswith('.csv') else []
@@ -753,53 +1223,109 @@ def process_files_to_excel(directory: str, output_file: str = "metadata_output.x
     if wb is not None and not output_file.endswith('.csv'):
         try:
             safe_excel_file = create_safe_filename(output_file)
-            logger.info(f"Saving Excel file: {safe_excel_file}")
+            logger.info("Saving Excel file: %s", safe_excel_file)
             wb.save(safe_excel_file)
+            result['excel'] = safe_excel_file
             print(f"Metadata extracted and saved to {safe_excel_file}")
             print(f"Processed {len(ordered_items)} items from {directory}")
             print(f"Format matches 'indice de ejemplo.xlsm' template")
         except PermissionError as e:
-            logger.error(f"Permission denied when saving Excel file: {e}")
+            logger.error("Permission denied when saving Excel file: %s", e)
             print(f"ERROR: Permission denied when saving {output_file}")
             print("Possible causes:")
             print("- File is open in Excel or another program")
             print("- Insufficient write permissions in the directory")
             print("Trying CSV export instead...")
-            csv_file = output_file.replace('.xlsx', '.csv').replace('.xlsm', '.csv')
-            export_to_csv(csv_data, csv_file)
-            return
+            result['csv'] = export_to_csv(data_rows, xl_to_csv(output_file))
+            result['csv_fallback'] = True
+            return result
         except Exception as e:
-            logger.error(f"Unexpected error saving Excel file: {e}")
-            logger.error(f"Full traceback:\n{traceback.format_exc()}")
+            logger.error("Unexpected error saving Excel file: %s", e)
+            logger.error("Full traceback:\n%s", traceback.format_exc())
             print(f"ERROR: Failed to save Excel file: {e}")
             print("Trying CSV export instead...")
-            csv_file = output_file.replace('.xlsx', '.csv').replace('.xlsm', '.csv')
-            export_to_csv(csv_data, csv_file)
-            return
+            result['csv'] = export_to_csv(data_rows, xl_to_csv(output_file))
+            result['csv_fallback'] = True
+            return result
         
         # Export to CSV if requested
         if export_csv:
-            csv_file = safe_excel_file.replace('.xlsx', '.csv').replace('.xlsm', '.csv')
-            export_to_csv(csv_data, csv_file)
+            result['csv'] = export_to_csv(csv_data, xl_to_csv(safe_excel_file))
     
     # Handle CSV-only output or fallback to CSV
     elif csv_data:
-        csv_file = create_safe_filename(output_file) if output_file.endswith('.csv') else output_file.replace('.xlsx', '.csv').replace('.xlsm', '.csv')
-        export_to_csv(csv_data, csv_file)
+        csv_file = export_to_csv(csv_data, output_file if output_file.endswith('.csv') else xl_to_csv(output_file))
+        result['csv'] = csv_file
         print(f"Metadata extracted and saved to {csv_file}")
         print(f"Processed {len(ordered_items)} items from {directory}")
         if not OPENPYXL_AVAILABLE:
             print("[INFO] CSV format used due to missing Excel dependencies")
         print(f"Format matches 'indice de ejemplo.xlsm' template")
+    
+    return result
 
 
-def main():
-    # Check and install dependencies FIRST, before any user interaction
-    deps_ok, dep_status = ensure_dependencies()
+def run_extraction(directory: str, output: str, export_csv: bool = False, csv_only: bool = False, litigant: str = "") -> dict:
+    """Run one extraction job with the same output options as the command line.
     
-    # Load the available dependencies  
-    load_dependencies(dep_status)
+    Returns the written paths as reported by process_files_to_excel.
+    """
+    if csv_only:
+        # CSV-only mode
+        csv_file = xl_to_csv(output)
+        logger.info("CSV-only mode enabled")
+        return process_files_to_excel(directory, csv_file, export_csv=True, litigant_name=litigant)
+    else:
+        # Normal mode (Excel + optional CSV)
+        return process_files_to_excel(directory, output, export_csv=export_csv, litigant_name=litigant)
+
+def run_server():
+    """Process jobs from stdin, one JSON object per line, replying with one JSON line each.
+    
+    A job looks like {"directory": "...", "output": "...", "csv": false,
+    "csv_only": false, "litigant": ""}; only "directory" is required. Keeping
+    one process alive pays interpreter startup and imports once for all jobs.
+    
+    A reply carries the paths actually written ("excel", "csv", None when not
+    written) and "csv_fallback"; "ok" is false unless every requested file was written.
+    """
+    # Dependency check without the interactive prompt: stdin carries the jobs
+    with contextlib.redirect_stdout(sys.stderr):
+        load_dependencies(check_and_install_dependencies(auto_install=True))
     
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            job = json.loads(line)
+            directory = job['directory']
+            if not os.path.isdir(directory):
+                raise NotADirectoryError(f"{directory} is not a valid directory")
+            
+            output = job.get('output', 'metadata_output.xlsx')
+            csv_only = job.get('csv_only', False)
+            export_csv = job.get('csv', False)
+            
+            logger.info("Server job: %s", directory)
+            # Progress messages go to stderr so stdout only carries replies
+            with contextlib.redirect_stdout(sys.stderr):
+                result = run_extraction(directory, output, export_csv=export_csv,
+                                        csv_only=csv_only, litigant=job.get('litigant', ''))
+            
+            reply = {"ok": True, **result}
+            wants_csv = csv_only or export_csv or output.endswith('.csv')
+            if not csv_only and not output.endswith('.csv') and result['excel'] is None:
+                reply.update(ok=False, error="The Excel file was not written")
+            elif wants_csv and result['csv'] is None:
+                reply.update(ok=False, error="The CSV file was not written")
+        except Exception as e:
+            logger.error("Server job failed: %s: %s", type(e).__name__, e)
+            logger.debug("Server job traceback:", exc_info=True)
+            reply = {"ok": False, "error": str(e)}
+        
+        print(json.dumps(reply), flush=True)
+
+def main():
     parser = argparse.ArgumentParser(description='Extract file metadata and write to Excel')
     parser.add_argument('--directory', '-d', 
                        default=os.getcwd(),
@@ -821,6 +1347,9 @@ def main():
     parser.add_argument('--litigant', '-l',
                        default='',
                        help='Name of the litigant (demandante) for the header')
+    parser.add_argument('--server',
+                       action='store_true',
+                       help='Process JSON jobs from stdin, one per line, in a single long-lived process')
     
     args = parser.parse_args()
     
@@ -828,39 +1357,45 @@ def main():
     global logger
     if args.log_file:
         # Setup file logging
-        file_handler = logging.FileHandler(args.log_file)
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        add_log_file(args.log_file)
         
     if args.debug:
         logger.setLevel(logging.DEBUG)
         logging.getLogger().setLevel(logging.DEBUG)
         logger.debug("Debug logging enabled")
     
-    logger.info(f"Starting file metadata extraction from: {args.directory}")
-    logger.info(f"Output file: {args.output}")
-    logger.info(f"Debug mode: {args.debug}")
+    if args.server:
+        run_server()
+        return
+    
+    logger.info("Starting file metadata extraction from: %s", args.directory)
+    logger.info("Output file: %s", args.output)
+    logger.info("Debug mode: %s", args.debug)
     
     if not os.path.isdir(args.directory):
-        logger.error(f"Directory not found: {args.directory}")
+        logger.error("Directory not found: %s", args.directory)
         print(f"Error: {args.directory} is not a valid directory")
         sys.exit(1)
     
+    # Check and install dependencies before processing; --help and invalid
+    # arguments exit above without paying for the check, and so do warm runs
+    # whose last check found the required packages (their result is reused)
+    stamp = dependency_stamp_path()
+    dep_status = load_dependency_stamp(stamp)
+    if dep_status is None:
+        deps_ok, dep_status = ensure_dependencies()
+        write_dependency_stamp(stamp, dep_status)
+    
+    # Load the available dependencies  
+    load_dependencies(dep_status)
+    
     try:
-        if args.csv_only:
-            # CSV-only mode
-            csv_file = args.output.replace('.xlsx', '.csv').replace('.xlsm', '.csv')
-            logger.info("CSV-only mode enabled")
-            process_files_to_excel(args.directory, csv_file, export_csv=True, litigant_name=args.litigant)
-        else:
-            # Normal mode (Excel + optional CSV)
-            process_files_to_excel(args.directory, args.output, export_csv=args.csv, litigant_name=args.litigant)
+        run_extraction(args.directory, args.output, export_csv=args.csv, csv_only=args.csv_only, litigant=args.litigant)
             
         logger.info("Processing completed successfully")
         
     except PermissionError as e:
-        logger.error(f"Permission error: {e}")
+        logger.error("Permission error: %s", e)
         print(f"\nERROR: Permission denied - {e}")
         print("\nTroubleshooting steps:")
         print("1. Close Excel or any program that might have the file open")
@@ -870,8 +1405,8 @@ def main():
         sys.exit(1)
         
     except Exception as e:
-        logger.error(f"Fatal error during processing: {e}")
-        logger.error(f"Full traceback:\n{traceback.format_exc()}")
+        logger.error("Fatal error during processing: %s", e)
+        logger.error("Full traceback:\n%s", traceback.format_exc())
         print(f"\nERROR: {e}")
         if args.debug:
             print("\nCheck debug logs for detailed error information.")
@@ -880,4 +1415,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for the worker processes in frozen Windows executables
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
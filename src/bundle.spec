@@ -8,18 +8,24 @@ a = Analysis(
     binaries=[],
     datas=[],
     hiddenimports=[
+        'pypdfium2',
         'PyPDF2',
         'fitz',
-        'openpyxl',
-        'mimetypes',
-        'csv',
-        'logging',
-        'traceback'
+        'openpyxl'
     ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=[
+        'tkinter',
+        'unittest',
+        'test',
+        'distutils',
+        'email',
+        'http',
+        'xmlrpc',
+        'pydoc_data'
+    ],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
@@ -28,20 +34,18 @@ a = Analysis(
 
 pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
 
+# onedir build without UPX: a onefile bundle is unpacked to a temp dir and
+# UPX-decompressed on every launch, which dominates the startup time
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.zipfiles,
-    a.datas,
     [],
+    exclude_binaries=True,
     name='file_metadata_extractor_standalone',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
+    upx=False,
     console=True,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -49,3 +53,14 @@ exe = EXE(
     codesign_identity=None,
     entitlements_file=None,
 )
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.zipfiles,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='file_metadata_extractor_standalone',
+)
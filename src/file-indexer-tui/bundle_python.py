@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 Python bundling script to create a standalone executable that includes Python runtime.
-This will create a single .exe file that doesn't require Python to be installed.
+This will create an application folder (PyInstaller onedir) that doesn't require
+Python to be installed and starts without extracting itself on every launch.
 """
 
 import os
@@ -34,18 +35,24 @@ a = Analysis(
     binaries=[],
     datas=[],
     hiddenimports=[
+        'pypdfium2',
         'PyPDF2',
         'fitz',
-        'openpyxl',
-        'mimetypes',
-        'csv',
-        'logging',
-        'traceback'
+        'openpyxl'
     ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=[
+        'tkinter',
+        'unittest',
+        'test',
+        'distutils',
+        'email',
+        'http',
+        'xmlrpc',
+        'pydoc_data'
+    ],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
@@ -54,20 +61,18 @@ a = Analysis(
 
 pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
 
+# onedir build without UPX: a onefile bundle is unpacked to a temp dir and
+# UPX-decompressed on every launch, which dominates the startup time
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.zipfiles,
-    a.datas,
     [],
+    exclude_binaries=True,
     name='file_metadata_extractor_standalone',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
+    upx=False,
     console=True,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -75,30 +80,36 @@ exe = EXE(
     codesign_identity=None,
     entitlements_file=None,
 )
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.zipfiles,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='file_metadata_extractor_standalone',
+)
 '''
     
     # Write spec file
     with open('bundle.spec', 'w') as f:
         f.write(spec_content)
     
-    # Build with PyInstaller
+    # Build with PyInstaller (onedir/console options come from the spec file)
     print("Building standalone executable...")
     subprocess.check_call([
         sys.executable, "-m", "PyInstaller", 
-        "--onefile",
-        "--console", 
-        "--name=file_metadata_extractor_standalone",
         "bundle.spec"
     ])
     
-    # Copy the built executable
-    if os.path.exists("dist/file_metadata_extractor_standalone.exe"):
-        shutil.copy2("dist/file_metadata_extractor_standalone.exe", "file_metadata_extractor_standalone.exe")
-        print("✅ Windows standalone executable created: file_metadata_extractor_standalone.exe")
-    
-    if os.path.exists("dist/file_metadata_extractor_standalone"):
-        shutil.copy2("dist/file_metadata_extractor_standalone", "file_metadata_extractor_standalone")
-        print("✅ Linux standalone executable created: file_metadata_extractor_standalone")
+    # Copy the built application folder
+    if os.path.isdir("dist/file_metadata_extractor_standalone"):
+        if os.path.exists("file_metadata_extractor_standalone"):
+            shutil.rmtree("file_metadata_extractor_standalone")
+        shutil.copytree("dist/file_metadata_extractor_standalone", "file_metadata_extractor_standalone")
+        print("✅ Standalone application folder created: file_metadata_extractor_standalone/")
     
     # Clean up
     if os.path.exists("build"):
@@ -188,8 +199,8 @@ def create_portable_solution():
     # Try to create bundled Python version
     try:
         create_bundled_version()
-        if os.path.exists("file_metadata_extractor_standalone.exe"):
-            shutil.copy2("file_metadata_extractor_standalone.exe", f"{portable_dir}/file_metadata_extractor_bundled.exe")
+        if os.path.isdir("file_metadata_extractor_standalone"):
+            shutil.copytree("file_metadata_extractor_standalone", f"{portable_dir}/bin", dirs_exist_ok=True)
     except Exception as e:
         print(f"Bundled Python creation failed: {e}")
         # Fall back to regular Python files
@@ -200,6 +211,8 @@ def create_portable_solution():
     unified_go_content = '''package main
 
 import (
+	"bufio"
+	"encoding/json"
 	"fmt"
 	"os"
 	"os/exec"
@@ -207,54 +220,131 @@ import (
 	"runtime"
 )
 
-func main() {
-	execDir, _ := filepath.Abs(filepath.Dir(os.Args[0]))
-	
-	// Try bundled Python version first
-	bundledPath := filepath.Join(execDir, "file_metadata_extractor_bundled.exe")
+// extractorCommand prefers the bundled Python version, then system Python
+func extractorCommand(execDir string, args []string) *exec.Cmd {
+	bundledName := "file_metadata_extractor_standalone"
+	if runtime.GOOS == "windows" {
+		bundledName += ".exe"
+	}
+	bundledPath := filepath.Join(execDir, "bin", bundledName)
 	if _, err := os.Stat(bundledPath); err == nil {
 		fmt.Println("Using bundled Python version...")
-		cmd := exec.Command(bundledPath, os.Args[1:]...)
-		cmd.Stdout = os.Stdout
-		cmd.Stderr = os.Stderr
-		cmd.Stdin = os.Stdin
-		cmd.Run()
-		return
+		return exec.Command(bundledPath, args...)
 	}
 	
-	// Fall back to regular Python
 	scriptPath := filepath.Join(execDir, "file_metadata_extractor.py")
 	if _, err := os.Stat(scriptPath); err == nil {
 		fmt.Println("Using system Python...")
-		var cmd *exec.Cmd
-		args := append([]string{scriptPath}, os.Args[1:]...)
-		
+		args = append([]string{scriptPath}, args...)
 		if runtime.GOOS == "windows" {
-			cmd = exec.Command("python", args...)
-		} else {
-			cmd = exec.Command("python3", args...)
+			return exec.Command("python", args...)
+		}
+		return exec.Command("python3", args...)
+	}
+	
+	return nil
+}
+
+// runBatch sends every directory as a job to one extractor started with --server,
+// so the bootloader and imports are paid once instead of once per directory
+func runBatch(cmd *exec.Cmd, dirs []string) int {
+	stdin, err := cmd.StdinPipe()
+	if err != nil {
+		fmt.Println("ERROR:", err)
+		return 1
+	}
+	stdout, err := cmd.StdoutPipe()
+	if err != nil {
+		fmt.Println("ERROR:", err)
+		return 1
+	}
+	cmd.Stderr = os.Stderr
+	if err := cmd.Start(); err != nil {
+		fmt.Println("ERROR:", err)
+		return 1
+	}
+	
+	replies := bufio.NewScanner(stdout)
+	failed := 0
+	for i, dir := range dirs {
+		dir, _ = filepath.Abs(dir)
+		// Each directory gets its own workbook in the current directory
+		output, _ := filepath.Abs(filepath.Base(dir) + "_metadata_output.xlsx")
+		job, _ := json.Marshal(map[string]string{"directory": dir, "output": output})
+		if _, err := stdin.Write(append(job, '\\n')); err != nil || !replies.Scan() {
+			fmt.Println("ERROR: the extractor stopped before finishing", dir)
+			failed += len(dirs) - i
+			break
 		}
 		
-		cmd.Stdout = os.Stdout
-		cmd.Stderr = os.Stderr
-		cmd.Stdin = os.Stdin
-		cmd.Run()
+		var reply struct {
+			OK    bool   `json:"ok"`
+			Error string `json:"error"`
+			Excel string `json:"excel"`
+		}
+		if err := json.Unmarshal(replies.Bytes(), &reply); err != nil || !reply.OK {
+			fmt.Printf("%s: ERROR: %s\\n", dir, reply.Error)
+			failed++
+			continue
+		}
+		fmt.Printf("%s: %s\\n", dir, reply.Excel)
+	}
+	
+	stdin.Close()
+	cmd.Wait()
+	if failed > 0 {
+		return 1
+	}
+	return 0
+}
+
+func main() {
+	execDir, _ := filepath.Abs(filepath.Dir(os.Args[0]))
+	
+	// --batch DIR...: process several directories with a single extractor process
+	batch := len(os.Args) > 2 && os.Args[1] == "--batch"
+	args := os.Args[1:]
+	if batch {
+		args = []string{"--server"}
+	}
+	
+	cmd := extractorCommand(execDir, args)
+	if cmd == nil {
+		fmt.Println("ERROR: No Python executable found!")
+		fmt.Println("Please ensure either:")
+		fmt.Println("1. bin/file_metadata_extractor_standalone.exe is present (no Python needed)")
+		fmt.Println("2. file_metadata_extractor.py is present and Python is installed")
 		return
 	}
 	
-	fmt.Println("ERROR: No Python executable found!")
-	fmt.Println("Please ensure either:")
-	fmt.Println("1. file_metadata_extractor_bundled.exe is present (no Python needed)")
-	fmt.Println("2. file_metadata_extractor.py is present and Python is installed")
+	if batch {
+		os.Exit(runBatch(cmd, os.Args[2:]))
+	}
+	
+	cmd.Stdout = os.Stdout
+	cmd.Stderr = os.Stderr
+	cmd.Stdin = os.Stdin
+	cmd.Run()
 }
 '''
     
     with open("unified_launcher.go", "w") as f:
         f.write(unified_go_content)
     
-    # Build unified launcher
-    if os.system("go build -o file_indexer_portable/file_metadata_extractor_unified.exe unified_launcher.go") == 0:
-        print("✅ Unified launcher created")
+    # Build unified launcher (stripped of debug info, without going through a shell)
+    go = shutil.which("go")
+    if go is None:
+        print("Go not found - skipping unified launcher")
+    else:
+        try:
+            subprocess.run([
+                go, "build", "-ldflags=-s -w", "-trimpath",
+                "-o", f"{portable_dir}/file_metadata_extractor_unified.exe",
+                "unified_launcher.go"
+            ], check=True)
+            print("✅ Unified launcher created")
+        except subprocess.CalledProcessError as e:
+            print(f"Unified launcher build failed: {e}")
     
     # Clean up
     if os.path.exists("unified_launcher.go"):
@@ -268,7 +358,7 @@ This is a completely portable version that works with or without Python installe
 ## What's Included
 
 - `file-indexer.exe` - Main TUI application
-- `file_metadata_extractor_bundled.exe` - Standalone Python processor (no Python needed)
+- `bin/` - Standalone Python processor (`file_metadata_extractor_standalone.exe`, no Python needed)
 - `file_metadata_extractor.py` - Backup Python script (requires Python)
 - `requirements.txt` - Python dependencies (if using backup)
 
@@ -3,10 +3,143 @@
 Create GitHub release with all necessary files
 """
 
+import mmap
 import os
 import shutil
-import zipfile
-from pathlib import Path
+import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+VERSION = "v1.0.0"
+
+# Release archive name for each package
+ARCHIVES = {
+    package: f"file-indexer-{package}-{VERSION}.{ext}"
+    for package, ext in (("windows", "zip"), ("linux", "tar.gz"),
+                         ("macos", "tar.gz"), ("source", "zip"))
+}
+
+def fast_copy(src, dst):
+    """Copy a file in the kernel with copy_file_range, keeping its metadata."""
+    
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is None:
+        shutil.copyfile(src, dst)
+    else:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            size = os.fstat(fsrc.fileno()).st_size
+            remaining = size
+            try:
+                while remaining > 0:
+                    copied = copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        # Some filesystems copy nothing without failing: finish in userspace
+                        fsrc.seek(size - remaining)
+                        fdst.seek(size - remaining)
+                        shutil.copyfileobj(fsrc, fdst)
+                        break
+                    remaining -= copied
+            except OSError:
+                # Filesystem without in-kernel copy support: start over in userspace
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+                shutil.copyfileobj(fsrc, fdst)
+    shutil.copystat(src, dst)
+
+def fan_out_copy(src, dst_dirs):
+    """Read a file once and write it, with its metadata, into every directory."""
+    
+    with open(src, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        # Large files are mapped instead of read so they are not held twice in memory
+        if size > 16 * 1024 * 1024:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            data = f.read()
+    try:
+        for dst_dir in dst_dirs:
+            dst = os.path.join(dst_dir, os.path.basename(src))
+            with open(dst, "wb") as out:
+                out.write(data)
+            shutil.copystat(src, dst)
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+def write_file(path, text):
+    """Write a generated text file with a single unbuffered write."""
+    
+    data = memoryview(text.encode("utf-8"))
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+def _walk(path):
+    """Yield the path of every file under path."""
+    
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk(entry.path)
+            else:
+                yield entry.path
+
+def write_zip(archive_path, package_dir):
+    """Zip a package directory with fast deflate, streaming each file into its entry."""
+    
+    import zipfile
+    
+    with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED,
+                         compresslevel=1, allowZip64=True) as zipf:
+        for file_path in _walk(package_dir):
+            # write() applies the archive's compresslevel, sizes the entry from the
+            # file's stat (choosing ZIP64 up front) and streams the data in chunks
+            zipf.write(file_path, os.path.relpath(file_path, package_dir))
+
+def write_tar(archive_path, package_dir):
+    """Tar and gzip a package directory with fast compression, on all cores if pigz is there."""
+    
+    import tarfile
+    
+    pigz = shutil.which("pigz")
+    if pigz is not None:
+        with open(archive_path, "wb") as out:
+            proc = subprocess.Popen([pigz, "-1", "-p", str(os.cpu_count() or 1)],
+                                    stdin=subprocess.PIPE, stdout=out)
+            with proc.stdin, tarfile.open(fileobj=proc.stdin, mode="w|") as tar:
+                tar.add(package_dir, arcname=".")
+        if proc.wait() == 0:
+            return
+        print(f"pigz failed for {archive_path} - falling back to tarfile")
+    
+    with tarfile.open(archive_path, "w:gz", compresslevel=1) as tar:
+        tar.add(package_dir, arcname=".")
+
+def fast_rmtree(root):
+    """Remove a directory tree, unlinking its files from a thread pool."""
+    
+    # Like shutil.rmtree: walking a symlinked root would empty the directory it points to
+    if os.path.islink(root):
+        raise OSError(f"Cannot remove {root}: it is a symbolic link")
+    files = []
+    dirs = []
+    for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+        files.extend(os.path.join(dirpath, name) for name in filenames)
+        # Symlinks to directories are listed with the directories but are unlinked
+        for name in dirnames:
+            path = os.path.join(dirpath, name)
+            if os.path.islink(path):
+                files.append(path)
+        dirs.append(dirpath)
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        list(executor.map(os.unlink, files))
+    # Bottom-up, so every directory is empty by the time it is removed
+    for dirpath in dirs:
+        os.rmdir(dirpath)
 
 def build_executables():
     """Build all executables before packaging."""
@@ -14,17 +147,20 @@ def build_executables():
     print("🔨 Building executables first...")
     
     # Run the build script
-    import subprocess
     try:
-        result = subprocess.run(["./build.sh"], check=True, capture_output=True, text=True)
+        # Only the tail of the build output is shown, so only the tail is kept
+        proc = subprocess.Popen(["./build.sh"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        with proc.stdout:
+            tail = deque(proc.stdout, maxlen=500)
+        returncode = proc.wait()
+        output = b"".join(tail).decode("utf-8", "replace")
+        if returncode != 0:
+            print(f"❌ Build failed: {subprocess.CalledProcessError(returncode, proc.args)}")
+            print("OUTPUT:", output)
+            return False
         print("✅ Build completed successfully!")
-        print(result.stdout[-500:])  # Show last 500 chars of output
+        print(output[-500:])  # Show last 500 chars of output
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Build failed: {e}")
-        print("STDOUT:", e.stdout)
-        print("STDERR:", e.stderr)
-        return False
     except FileNotFoundError:
         print("❌ build.sh not found or not executable")
         print("Please run: chmod +x build.sh")
@@ -38,12 +174,16 @@ def create_release_packages():
         print("❌ Cannot create packages without successful build")
         return None
     
+    # Only needed once the build succeeded: multiprocessing, like zipfile and tarfile
+    # in the archive writers, is not loaded when there is nothing to package
+    from concurrent.futures import ProcessPoolExecutor
+    
     print("\n📦 Creating release packages...")
     
     # Create release directory
     release_dir = "release"
     if os.path.exists(release_dir):
-        shutil.rmtree(release_dir)
+        fast_rmtree(release_dir)
     os.makedirs(release_dir)
     
     # Common files needed for all packages
@@ -53,24 +193,39 @@ def create_release_packages():
         "README.md",
         "RELEASE_NOTES.md"
     ]
+    source_files = [
+        "main.go",
+        "go.mod", 
+        "build.sh",
+        *common_files
+    ]
+    
+    windows_dir = f"{release_dir}/windows"
+    linux_dir = f"{release_dir}/linux"
+    macos_dir = f"{release_dir}/macos"
+    source_dir = f"{release_dir}/source"
+    for package_dir in (windows_dir, linux_dir, macos_dir, source_dir):
+        os.makedirs(package_dir)
+    
+    # Copy the shared files into every package at once; each file is read a
+    # single time and the files are handled in parallel
+    present_files = [file for file in source_files if os.path.exists(file)]
+    copies = [(file, (windows_dir, linux_dir, macos_dir, source_dir) if file in common_files
+                     else (source_dir,))
+              for file in present_files]
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(lambda copy: fan_out_copy(*copy), copies))
     
     # Windows package
     print("Creating Windows package...")
-    windows_dir = f"{release_dir}/windows"
-    os.makedirs(windows_dir)
     
     # Copy Windows binary
     if os.path.exists("file-indexer-windows.exe"):
-        shutil.copy2("file-indexer-windows.exe", f"{windows_dir}/file-indexer.exe")
+        fast_copy("file-indexer-windows.exe", f"{windows_dir}/file-indexer.exe")
         print("✓ Copied file-indexer-windows.exe")
     else:
         print("❌ file-indexer-windows.exe not found - run ./build.sh first")
     
-    # Copy common files
-    for file in common_files:
-        if os.path.exists(file):
-            shutil.copy2(file, windows_dir)
-    
     # Create Windows-specific README
     windows_readme = """# File Indexer for Windows
 
@@ -102,32 +257,15 @@ def create_release_packages():
 See README.md for full documentation.
 """
     
-    with open(f"{windows_dir}/WINDOWS_README.txt", "w") as f:
-        f.write(windows_readme)
-    
-    # Create Windows ZIP
-    with zipfile.ZipFile(f"{release_dir}/file-indexer-windows-v1.0.0.zip", "w") as zipf:
-        for root, dirs, files in os.walk(windows_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arcname = os.path.relpath(file_path, windows_dir)
-                zipf.write(file_path, arcname)
-    
-    print("✅ Windows package: file-indexer-windows-v1.0.0.zip")
+    write_file(f"{windows_dir}/WINDOWS_README.txt", windows_readme)
     
     # Linux package
     print("Creating Linux package...")
-    linux_dir = f"{release_dir}/linux"
-    os.makedirs(linux_dir)
     
     if os.path.exists("file-indexer-linux"):
-        shutil.copy2("file-indexer-linux", f"{linux_dir}/file-indexer")
+        fast_copy("file-indexer-linux", f"{linux_dir}/file-indexer")
         os.chmod(f"{linux_dir}/file-indexer", 0o755)
     
-    for file in common_files:
-        if os.path.exists(file):
-            shutil.copy2(file, linux_dir)
-    
     # Create Linux setup script
     linux_setup = """#!/bin/bash
 # File Indexer Linux Setup
@@ -156,77 +294,60 @@ echo "✅ Setup complete!"
 echo "Run: ./file-indexer"
 """
     
-    with open(f"{linux_dir}/setup.sh", "w") as f:
-        f.write(linux_setup)
+    write_file(f"{linux_dir}/setup.sh", linux_setup)
     os.chmod(f"{linux_dir}/setup.sh", 0o755)
     
-    # Create Linux tar.gz
-    shutil.make_archive(f"{release_dir}/file-indexer-linux-v1.0.0", "gztar", linux_dir)
-    print("✅ Linux package: file-indexer-linux-v1.0.0.tar.gz")
-    
     # macOS package  
     print("Creating macOS package...")
-    macos_dir = f"{release_dir}/macos"
-    os.makedirs(macos_dir)
     
     if os.path.exists("file-indexer-macos"):
-        shutil.copy2("file-indexer-macos", f"{macos_dir}/file-indexer")
+        fast_copy("file-indexer-macos", f"{macos_dir}/file-indexer")
         os.chmod(f"{macos_dir}/file-indexer", 0o755)
     
-    for file in common_files:
-        if os.path.exists(file):
-            shutil.copy2(file, macos_dir)
-    
     # macOS setup is same as Linux
     shutil.copy2(f"{linux_dir}/setup.sh", macos_dir)
     
-    shutil.make_archive(f"{release_dir}/file-indexer-macos-v1.0.0", "gztar", macos_dir)
-    print("✅ macOS package: file-indexer-macos-v1.0.0.tar.gz")
-    
-    # Source code package
-    print("Creating source code package...")
-    source_files = [
-        "main.go",
-        "go.mod", 
-        "build.sh",
-        "file_metadata_extractor.py",
-        "requirements.txt",
-        "README.md",
-        "RELEASE_NOTES.md"
+    # Build the four archives in parallel now that every package dir is complete
+    print("Creating archives...")
+    archives = [
+        (write_zip, f"{release_dir}/{ARCHIVES['windows']}", windows_dir,
+         f"✅ Windows package: {ARCHIVES['windows']}"),
+        (write_tar, f"{release_dir}/{ARCHIVES['linux']}", linux_dir,
+         f"✅ Linux package: {ARCHIVES['linux']}"),
+        (write_tar, f"{release_dir}/{ARCHIVES['macos']}", macos_dir,
+         f"✅ macOS package: {ARCHIVES['macos']}"),
+        (write_zip, f"{release_dir}/{ARCHIVES['source']}", source_dir,
+         f"✅ Source package: {ARCHIVES['source']}"),
     ]
-    
-    source_dir = f"{release_dir}/source"
-    os.makedirs(source_dir)
-    
-    for file in source_files:
-        if os.path.exists(file):
-            shutil.copy2(file, source_dir)
-    
-    shutil.make_archive(f"{release_dir}/file-indexer-source-v1.0.0", "zip", source_dir)
-    print("✅ Source package: file-indexer-source-v1.0.0.zip")
+    with ProcessPoolExecutor(max_workers=len(archives)) as executor:
+        futures = [executor.submit(build, archive_path, package_dir)
+                   for build, archive_path, package_dir, _ in archives]
+        for future, (*_, message) in zip(futures, archives):
+            future.result()
+            print(message)
     
     # Create release summary
-    summary = f"""# File Indexer v1.0.0 Release
+    summary = f"""# File Indexer {VERSION} Release
 
 ## Download Links
 
 ### Windows (Recommended)
-- **file-indexer-windows-v1.0.0.zip** - Complete Windows package
+- **{ARCHIVES['windows']}** - Complete Windows package
   - Includes: TUI executable + Python script + dependencies list
   - Requires: Python 3.6+ installation
 
 ### Linux  
-- **file-indexer-linux-v1.0.0.tar.gz** - Complete Linux package
+- **{ARCHIVES['linux']}** - Complete Linux package
   - Includes: TUI executable + Python script + setup script
   - Run: `./setup.sh` then `./file-indexer`
 
 ### macOS
-- **file-indexer-macos-v1.0.0.tar.gz** - Complete macOS package  
+- **{ARCHIVES['macos']}** - Complete macOS package  
   - Includes: TUI executable + Python script + setup script
   - Run: `./setup.sh` then `./file-indexer`
 
 ### Source Code
-- **file-indexer-source-v1.0.0.zip** - Full source code
+- **{ARCHIVES['source']}** - Full source code
   - Build with: `./build.sh` (requires Go 1.21+)
 
 ## Quick Start
@@ -237,7 +358,7 @@ echo "Run: ./file-indexer"
 4. **Run setup** (Linux/macOS: `./setup.sh`, Windows: `pip install -r requirements.txt`)
 5. **Launch**: `./file-indexer` (Linux/macOS) or double-click `file-indexer.exe` (Windows)
 
-## What's New in v1.0.0
+## What's New in {VERSION}
 
 ✅ **Fixed Navigation** - Clear path display, proper Downloads startup
 ✅ **Better UX** - Space to select, Tab for smart autocomplete  
@@ -255,15 +376,15 @@ See RELEASE_NOTES.md for full details.
 Working on a single .exe with embedded Python runtime - no Python installation needed!
 """
     
-    with open(f"{release_dir}/RELEASE_SUMMARY.md", "w") as f:
-        f.write(summary)
+    write_file(f"{release_dir}/RELEASE_SUMMARY.md", summary)
     
     # List all created files
     print("\n📦 Release packages created:")
-    for file in os.listdir(release_dir):
-        if file.endswith(('.zip', '.tar.gz')):
-            size = os.path.getsize(f"{release_dir}/{file}") / 1024 / 1024
-            print(f"  📄 {file} ({size:.1f}MB)")
+    with os.scandir(release_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(('.zip', '.tar.gz')):
+                size = entry.stat().st_size / 1024 / 1024
+                print(f"  📄 {entry.name} ({size:.1f}MB)")
     
     print(f"\n✅ All release files in: {release_dir}/")
     return release_dir
@@ -271,11 +392,11 @@ Working on a single .exe with embedded Python runtime - no Python installation n
 def create_github_release_script():
     """Create a script for GitHub release creation."""
     
-    script = '''#!/bin/bash
+    script = f'''#!/bin/bash
 # GitHub Release Creation Script
 # Run this after pushing to GitHub
 
-VERSION="v1.0.0"
+VERSION="{VERSION}"
 REPO="your-username/file-indexer-tui"  # Update with your repo
 
 echo "Creating GitHub release $VERSION..."
@@ -284,17 +405,16 @@ echo "Creating GitHub release $VERSION..."
 gh release create $VERSION \\
     --title "File Indexer TUI $VERSION" \\
     --notes-file RELEASE_NOTES.md \\
-    release/file-indexer-windows-v1.0.0.zip \\
-    release/file-indexer-linux-v1.0.0.tar.gz \\
-    release/file-indexer-macos-v1.0.0.tar.gz \\
-    release/file-indexer-source-v1.0.0.zip
+    release/{ARCHIVES["windows"]} \\
+    release/{ARCHIVES["linux"]} \\
+    release/{ARCHIVES["macos"]} \\
+    release/{ARCHIVES["source"]}
 
 echo "✅ Release created!"
 echo "View at: https://github.com/$REPO/releases/tag/$VERSION"
 '''
     
-    with open("create_github_release.sh", "w") as f:
-        f.write(script)
+    write_file("create_github_release.sh", script)
     os.chmod("create_github_release.sh", 0o755)
     
     print("📝 GitHub release script created: create_github_release.sh")
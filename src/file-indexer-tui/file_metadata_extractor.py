@@ -4,13 +4,11 @@ import os
 import sys
 import argparse
 from datetime import datetime
-from pathlib import Path
 import re
 import logging
 import traceback
 import mimetypes
 import csv
-import stat
 import tempfile
 from typing import List, Tuple, Optional
 
@@ -73,15 +71,13 @@ def setup_logging(debug: bool = False):
 logger = setup_logging()
 
 try:
-    from openpyxl import load_workbook, Workbook
-    from openpyxl.utils import get_column_letter
+    from openpyxl import Workbook
     from openpyxl.styles import Font, Alignment, Border, Side
 except ImportError:
     print("[INSTALL] openpyxl not found. Attempting auto-install...")
     if install_package("openpyxl", "3.1.2"):
         try:
-            from openpyxl import load_workbook, Workbook
-            from openpyxl.utils import get_column_letter
+            from openpyxl import Workbook
             from openpyxl.styles import Font, Alignment, Border, Side
             print("[SUCCESS] openpyxl successfully installed!")
         except ImportError:
@@ -296,7 +292,8 @@ def get_file_size(file_path: str) -> str:
 def count_files_in_directory(dir_path: str) -> int:
     """Count number of files in a directory."""
     try:
-        return len([f for f in os.listdir(dir_path) if os.path.isfile(os.path.join(dir_path, f))])
+        with os.scandir(dir_path) as entries:
+            return sum(1 for entry in entries if entry.is_file())
     except Exception:
         return 0
 
@@ -17,12 +17,13 @@ def create_test_pdf(filename, num_pages, content_text):
         c.drawString(100, height - 160, content_text)
         
         # Add some varied content to make different file sizes
-        y_pos = height - 200
-        for i in range(page * 5 + 10):  # Different amounts of text per page
-            c.drawString(100, y_pos, f"This is line {i} of content to vary file size and make it realistic.")
-            y_pos -= 20
-            if y_pos < 100:
-                break
+        # (different amounts of text per page, at most 25 lines 20pt apart to stay above y=100)
+        lines = [f"This is line {i} of content to vary file size and make it realistic."
+                 for i in range(min(page * 5 + 10, 25))]
+        text = c.beginText(100, height - 200)
+        text.setLeading(20)
+        text.textLines("\n".join(lines))
+        c.drawText(text)
                 
         if page < num_pages - 1:
             c.showPage()